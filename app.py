@@ -1,30 +1,93 @@
+import hashlib
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import streamlit as st
 import pandas as pd
 import datahelper
-from datahelper import read_csv_any_encoding
 
 # ------------------------------------------------------------
 # Helper Function for Simple Statistical Q&A
 # ------------------------------------------------------------
-def get_answer_to_question(question, df):
-    question = question.lower()
+def pearson_corr(x, y):
+    """
+    Pearson correlation from single-pass sums over two numeric series.
+    Returns None when the inputs are non-numeric, empty, or have zero
+    variance; callers render that as an unable-to-compute answer.
+    """
     try:
-        if "average closing price" in question:
-            return f"The average closing price is {df['Close'].mean():.2f}"
-        elif "highest price" in question:
-            return f"The highest price recorded is {df['High'].max():.2f}"
-        elif "lowest price" in question:
-            return f"The lowest price recorded is {df['Low'].min():.2f}"
-        elif "trading volume" in question:
-            return f"The average trading volume is {df['Volume'].mean():.2f}"
-        elif "trend" in question and "price" in question:
-            return "Trend analysis can be visualized through a line chart showing closing prices over time."
-        elif "correlation" in question and "price" in question:
-            return f"The correlation between opening and closing prices is {df['Open'].corr(df['Close']):.3f}"
-        else:
-            return "Answer not available for this question."
-    except Exception:
-        return "Unable to compute this question — column may not exist."
+        a = x.to_numpy(dtype=np.float64, na_value=np.nan)
+        b = y.to_numpy(dtype=np.float64, na_value=np.nan)
+    except (TypeError, ValueError):
+        return None
+    mask = ~(np.isnan(a) | np.isnan(b))
+    if not mask.all():
+        a, b = a[mask], b[mask]
+    n = a.size
+    if n == 0:
+        return None
+    sa, sb = a.sum(), b.sum()
+    sab, saa, sbb = (a * b).sum(), (a * a).sum(), (b * b).sum()
+    denom = math.sqrt((n * saa - sa * sa) * (n * sbb - sb * sb))
+    return (n * sab - sa * sb) / denom if denom else None
+
+def compute_question_stats(df):
+    """Scan the numeric columns once so each question is a dict lookup."""
+    cols = set(df.columns)
+
+    def stat(col, op):
+        # None for absent or present-but-unusable (e.g. "$1.00" strings)
+        # columns, so one bad column degrades one answer, not the report.
+        if col not in cols or not pd.api.types.is_numeric_dtype(df[col]):
+            return None
+        try:
+            return op(df[col])
+        except (TypeError, ValueError):
+            return None
+
+    return {
+        "close_mean": stat("Close", lambda s: s.mean()),
+        "high_max": stat("High", lambda s: s.max()),
+        "low_min": stat("Low", lambda s: s.min()),
+        "vol_mean": stat("Volume", lambda s: s.mean()),
+        "open_close_corr": pearson_corr(df["Open"], df["Close"]) if {"Open", "Close"} <= cols else None,
+    }
+
+# Keyword pattern -> required columns -> stat key -> answer template,
+# compiled once at import. Order preserves the priority of the original
+# elif chain; a stat key of None marks a static answer.
+_HANDLERS = [
+    (re.compile(r"average closing price"), frozenset({"Close"}),
+     "close_mean", "The average closing price is {:.2f}"),
+    (re.compile(r"highest price"), frozenset({"High"}),
+     "high_max", "The highest price recorded is {:.2f}"),
+    (re.compile(r"lowest price"), frozenset({"Low"}),
+     "low_min", "The lowest price recorded is {:.2f}"),
+    (re.compile(r"trading volume"), frozenset({"Volume"}),
+     "vol_mean", "The average trading volume is {:.2f}"),
+    (re.compile(r"(?=.*trend)(?=.*price)", re.DOTALL), frozenset(),
+     None, "Trend analysis can be visualized through a line chart showing closing prices over time."),
+    (re.compile(r"(?=.*correlation)(?=.*price)", re.DOTALL), frozenset({"Open", "Close"}),
+     "open_close_corr", "The correlation between opening and closing prices is {:.3f}"),
+]
+
+def get_answer_to_question(question, stats, cols):
+    question = question.lower()
+    for pattern, required, stat_key, template in _HANDLERS:
+        if not pattern.search(question):
+            continue
+        if required - cols:
+            missing = ", ".join(sorted(required - cols))
+            return f"Unable to compute this question — missing column(s): {missing}."
+        if stat_key is None:
+            return template
+        value = stats[stat_key]
+        if value is None:
+            return "Unable to compute this question — column may not be numeric."
+        return template.format(value)
+    return "Answer not available for this question."
 
 # ------------------------------------------------------------
 # Initialize Streamlit Session State
@@ -60,18 +123,30 @@ col_left, _, col_right = st.columns([4, 0.5, 7])
 # ------------------------------------------------------------
 if st.session_state.dataload and loaded_file is not None:
 
+    # ttl keeps the parsed frame around for an hour so concurrent
+    # sessions uploading the same file share one parse without the
+    # cache growing unbounded.
+    @st.cache_data(show_spinner=False, ttl=3600)
+    def load_df(file_bytes: bytes) -> pd.DataFrame:
+        return datahelper.cached_parquet_load(file_bytes)
+
     @st.cache_data
-    def summarize():
-        loaded_file.seek(0)
-        return datahelper.summarize_csv(filename=loaded_file)
+    def summarize(file_bytes: bytes):
+        summary = datahelper.summarize_csv(load_df(file_bytes), df_id=hashlib.sha256(file_bytes).hexdigest())
+        # Materialize the lazy tables inside the cached call so reruns
+        # unpickle them instead of recomputing describe per interaction.
+        return summary.materialize()
 
-    data_summary = summarize()
-    df = read_csv_any_encoding(loaded_file)
+    file_bytes = loaded_file.getvalue()
+    df_id = hashlib.sha256(file_bytes).hexdigest()
+    df = load_df(file_bytes)
+    data_summary = summarize(file_bytes)
 
     # --------------------------------------------------------
     # LEFT PANEL: Dataset Summary
     # --------------------------------------------------------
-    with col_left:
+    @st.fragment
+    def render_summary(data_summary):
         st.info("📊 Data Summary")
         st.subheader("🔹 Data Preview")
         st.dataframe(data_summary["initial_data_sample"], width="stretch")
@@ -92,6 +167,14 @@ if st.session_state.dataload and loaded_file is not None:
         st.subheader("🔹 Statistical Summary")
         st.dataframe(data_summary["essential_metrics"], width="stretch")
 
+        if data_summary["categorical_metrics"] is not None:
+            st.divider()
+            st.subheader("🔹 Categorical Columns")
+            st.dataframe(data_summary["categorical_metrics"], width="stretch")
+
+    with col_left:
+        render_summary(data_summary)
+
     # --------------------------------------------------------
     # RIGHT PANEL: Interactive Features
     # --------------------------------------------------------
@@ -101,60 +184,82 @@ if st.session_state.dataload and loaded_file is not None:
         analyze_btn = st.button("Examine Feature")
         st.divider()
 
-        @st.cache_data
-        def explore_feature(file_obj, variable):
-            file_obj.seek(0)
-            df_local = datahelper.get_dataframe(file_obj)
-            if variable in df_local.columns:
-                st.bar_chart(df_local, y=[variable])
-                file_obj.seek(0)
-                st.success(datahelper.analyze_trend(file_obj, variable))
+        def explore_feature(dataframe, variable):
+            if variable in dataframe.columns:
+                series = dataframe[variable]
+                if len(series) > 2000 and pd.api.types.is_numeric_dtype(series):
+                    # Bucket-mean down to <=2000 bars; the browser cannot
+                    # usefully render more and the payload shrinks ~10-100x.
+                    # Ceiling division so the cap holds for any length.
+                    bucket = -(-len(series) // 2000)
+                    series = series.groupby(np.arange(len(series)) // bucket).mean()
+                st.bar_chart(series)
+                st.success(datahelper.analyze_trend(dataframe, variable, df_id=df_id))
             else:
                 st.warning(f"The column '{variable}' was not found in the dataset.")
 
         if analyze_btn and feature:
-            explore_feature(loaded_file, feature)
+            explore_feature(df, feature)
 
         # ----------------------------------------------------
-        # Q&A Section
+        # Q&A Section (fragment: typing here reruns only this block,
+        # not the summary panel above)
         # ----------------------------------------------------
-        st.subheader("💬 Ask Questions About Your Data")
-        for i in range(3):
-            st.session_state.questions[i] = st.text_input(
-                f"Question {i + 1}",
-                value=st.session_state.questions[i],
-                key=f"q_{i}",
-            )
-        if st.button("➕ Add Another Question"):
-            st.session_state.questions.append("")
-
-        for i, q in enumerate(st.session_state.questions[3:], start=4):
-            st.session_state.questions[i] = st.text_input(
-                f"Question {i}",
-                value=q,
-                key=f"q_extra_{i}",
-            )
+        @st.fragment
+        def render_qna(dataframe):
+            st.subheader("💬 Ask Questions About Your Data")
+            if st.button("➕ Add Another Question"):
+                st.session_state.questions.append("")
 
-        st.divider()
+            # The form batches all question edits into one rerun on
+            # submit instead of a rerun per keystroke.
+            with st.form("qna_form"):
+                for i in range(3):
+                    st.session_state.questions[i] = st.text_input(
+                        f"Question {i + 1}",
+                        value=st.session_state.questions[i],
+                        key=f"q_{i}",
+                    )
+                for i, q in enumerate(st.session_state.questions[3:], start=3):
+                    st.session_state.questions[i] = st.text_input(
+                        f"Question {i + 1}",
+                        value=q,
+                        key=f"q_extra_{i}",
+                    )
 
-        # ----------------------------------------------------
-        # Generate Executive Summary Report
-        # ----------------------------------------------------
-        report_title = st.text_input("Enter report title:", "Executive Summary Report")
-        if st.button("🚀 Generate Report"):
-            report = f"Title: {report_title}\n\n"
-            for q in st.session_state.questions:
-                if q.strip():
-                    ans = get_answer_to_question(q, df)
+                st.divider()
+                report_title = st.text_input("Enter report title:", "Executive Summary Report")
+                generate_btn = st.form_submit_button("🚀 Generate Report")
+
+            # ------------------------------------------------
+            # Generate Executive Summary Report
+            # ------------------------------------------------
+            if generate_btn:
+                report = f"Title: {report_title}\n\n"
+                stats = compute_question_stats(dataframe)
+                cols = set(dataframe.columns)
+                nonempty_questions = [q for q in st.session_state.questions if q.strip()]
+                # Answers are independent, so issue them concurrently;
+                # this keeps the report path flat if questions ever
+                # route through network-bound LLM calls.
+                with st.spinner("Answering questions..."):
+                    with ThreadPoolExecutor(max_workers=8) as executor:
+                        answers = list(executor.map(
+                            lambda q: get_answer_to_question(q, stats, cols),
+                            nonempty_questions,
+                        ))
+                for q, ans in zip(nonempty_questions, answers):
                     report += f"Q: {q}\nA: {ans}\n\n"
 
-            st.text_area("Generated Executive Summary", report, height=300)
-            st.download_button(
-                "⬇️ Download Report",
-                data=report,
-                file_name="executive_summary.txt",
-                mime="text/plain"
-            )
+                st.text_area("Generated Executive Summary", report, height=300)
+                st.download_button(
+                    "⬇️ Download Report",
+                    data=report,
+                    file_name="executive_summary.txt",
+                    mime="text/plain"
+                )
+
+        render_qna(df)
 
 else:
     st.info("📥 Please upload a CSV file and click 'Load Dataset' to begin.")